@@ -1,80 +1,186 @@
 import argparse
-import json
+import functools
+import multiprocessing
+import os
 import re
-import statistics
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin
 
+import numpy as np
+import orjson
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 
-GENERIC_LINKS = {
+GENERIC_LINKS = frozenset({
     "clicca qui", "click here", "read more", "scopri di più", "learn more",
     "qui", "more", "leggi di più", "approfondisci", "continua", "dettagli",
     "vai", "open", "info", "link", "discover", "see more", "view more"
-}
+})
+# anchor che sono solo selettori di lingua
+LANG_SWITCH = frozenset({"it","ita","en","eng","de","fr","es"})
+# role che marcano un'immagine come decorativa
+PRESENTATIONAL_ROLES = frozenset({"presentation", "none"})
+
+_WS_RE = re.compile(r"\s+")
+# token delimitati da spazi, come in txt.split()
+_SPLIT_TOKEN_RE = re.compile(r"\S+")
+_WORD_RE = re.compile(r"[A-Za-zÀ-ÖØ-öø-ÿ']+")
+# una frase con almeno una parola: parte dal primo carattere di parola
+# e arriva al terminatore, quindi un match per frase
+_WORDY_SENT_RE = re.compile(r"[A-Za-zÀ-ÖØ-öø-ÿ'][^.!?]*")
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-                  "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+                  "(KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    # gzip/deflate, più br/zstd se i relativi decoder sono installati
+    "Accept-Encoding": ACCEPT_ENCODING
 }
 
+# rimuovi elementi inutili per la leggibilità
+NOISE_TAGS = ["script","style","noscript","svg","meta","link","iframe"]
+# elimina blocchi tipici di navigazione/legali
+NOISE_SELECTORS = [
+    "nav","header","footer",
+    ".cookie",".cookies",".gdpr",".consent",".banner",
+    ".breadcrumb",".menu",".navbar",".offcanvas",
+    ".newsletter",".modal",".social",".credits",".legal",".policy",".privacy",".cookie-policy"
+]
+NOISE_SELECTOR = ",".join(NOISE_TAGS + NOISE_SELECTORS)
+
+# (connect, read) timeout in secondi
+TIMEOUT = (5, 15)
+# limite sui byte (decompressi) letti per pagina
+MAX_HTML_BYTES = 5_000_000
+
+def _make_session() -> requests.Session:
+    # sessione condivisa: riusa le connessioni keep-alive tra più chiamate a run()
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16,
+                          max_retries=Retry(total=2, backoff_factor=0.3))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+_SESSION = _make_session()
+
 def fetch_html(url: str) -> str:
-    resp = requests.get(url, headers=HEADERS, timeout=15)
-    resp.raise_for_status()
-    return resp.text
+    with _SESSION.get(url, timeout=TIMEOUT, stream=True) as resp:
+        resp.raise_for_status()
+        raw = resp.raw.read(MAX_HTML_BYTES, decode_content=True)
+        encoding = resp.encoding
+    if encoding is None and chardet is not None:
+        # nessun charset dichiarato: rilevalo dai byte letti, come resp.apparent_encoding
+        encoding = chardet.detect(raw)["encoding"]
+    try:
+        return raw.decode(encoding or "utf-8", "replace")
+    except LookupError:  # charset sconosciuto dichiarato dal server
+        return raw.decode("utf-8", "replace")
+
+@functools.lru_cache(maxsize=4096)
+def _join(base_url: str, rel: str) -> str:
+    # molte pagine ripetono gli stessi href/src: evita di ri-parsare l'URL
+    return urljoin(base_url, rel)
 
 def parse_dom(html: str):
-    from bs4 import BeautifulSoup
-    soup = BeautifulSoup(html, "html.parser")
-    # rimuovi elementi inutili per la leggibilità
-    for tag in soup(["script","style","noscript","svg","meta","link","iframe"]):
-        tag.decompose()
-    # elimina blocchi tipici di navigazione/legali
-    selectors = [
-        "nav","header","footer",
-        ".cookie",".cookies",".gdpr",".consent",".banner",
-        ".breadcrumb",".menu",".navbar",".offcanvas",
-        ".newsletter",".modal",".social",".credits",".legal",".policy",".privacy",".cookie-policy"
-    ]
-    for sel in selectors:
-        for el in soup.select(sel):
+    soup = BeautifulSoup(html, "lxml")
+    # un solo select per tutto il rumore; i match annidati in un blocco
+    # già rimosso risultano decomposed e vanno saltati
+    for el in soup.select(NOISE_SELECTOR):
+        if not el.decomposed:
             el.decompose()
     return soup
 
-# ---------- IMAGES ----------
-def extract_images(soup: BeautifulSoup, base_url: str):
-    imgs = []
-    for img in soup.find_all("img"):
-        src = img.get("src") or ""
-        if not src:
-            continue
-        # skip tiny data URIs
-        if src.startswith("data:"):
-            continue
-        role = (img.get("role") or "").strip().lower()
-        alt = (img.get("alt") or "").strip()
-        imgs.append({
-            "img_src": urljoin(base_url, src),
-            "role": role,
-            "alt_text": alt
-        })
-    return imgs
+# ---------- EXTRACTION ----------
+# layout a colonne (liste parallele) invece di una lista di dict per elemento
+Images = namedtuple("Images", "src alt_len presentational")
+Links = namedtuple("Links", "anchor_text href")
+Paragraphs = namedtuple("Paragraphs", "id text snippet")
+
+def extract_all(soup: BeautifulSoup, base_url: str, limit=40):
+    """
+    Una sola visita dell'albero: raccoglie immagini, link e paragrafi.
+    I paragrafi (<p>, <li>) sono al massimo `limit`.
+    """
+    imgs = Images([], [], [])
+    links = Links([], [])
+    paras = Paragraphs([], [], [])
+    seen, seen_raw = set(), set()  # chiavi (testo, href) dei link già visti
+    i = 0  # indice tra i nodi <p>/<li>, usato per gli id
+    for el in soup.descendants:
+        name = getattr(el, "name", None)
+        if name == "img":
+            # attributi letti direttamente dal dict attrs, senza passare da Tag.get
+            attrs = el.attrs
+            src = attrs.get("src") or ""
+            if not src:
+                continue
+            # skip tiny data URIs
+            if src.startswith("data:"):
+                continue
+            role = (attrs.get("role") or "").strip().lower()
+            # presentational / decorative hints: il role decide prima di guardare l'alt
+            if role in PRESENTATIONAL_ROLES:
+                alt_len = 0
+                presentational = True
+            else:
+                alt_len = len((attrs.get("alt") or "").strip())
+                presentational = alt_len == 0  # empty alt often used for decorative
+            imgs.src.append(_join(base_url, src))
+            imgs.alt_len.append(alt_len)
+            imgs.presentational.append(presentational)
+        elif name == "a":
+            href = el.attrs.get("href") or ""
+            if not href:
+                continue
+            href = _join(base_url, href)
+            raw = el.get_text(" ")
+            # de-duplica prima di pulire il testo: i duplicati esatti non passano da clean_text
+            if (raw, href) in seen_raw:
+                continue
+            seen_raw.add((raw, href))
+            text = clean_text(raw)
+            if (text, href) in seen:
+                continue
+            seen.add((text, href))
+            links.anchor_text.append(text)
+            links.href.append(href)
+        elif name == "p" or name == "li":
+            node_id = i
+            i += 1
+            if len(paras.id) >= limit:
+                continue
+            raw = el.get_text(" ")
+            # clean_text non allunga il testo, tranne lower() su "İ" (U+0130,
+            # unico carattere che diventa 2): con quella correzione il
+            # controllo sul grezzo è un limite esatto e salta la normalizzazione
+            if len(raw) + raw.count("\u0130") < 40:
+                continue
+            txt = clean_text(raw)
+            if len(txt) < 40:  # ignora pezzi troppo corti/rumore
+                continue
+            paras.id.append(f"node-{node_id}")
+            paras.text.append(txt)
+            paras.snippet.append(txt if len(txt) <= 160 else txt[:160] + "...")
+    return imgs, links, paras
 
+# ---------- IMAGES ----------
 def evaluate_images_baseline(images):
     """
     Regola semplice:
     - Se <img> NON è presentational e ha alt mancante o troppo corto → issue.
     """
-    issues = []
-    total = len(images)
-    for im in images:
-        role = im["role"]
-        alt = im["alt_text"]
-        # presentational / decorative hints
-        is_presentational = role in {"presentation", "none"} or alt == ""  # empty alt often used for decorative
-        # If not explicitly decorative and alt is missing/too short, flag
-        if not is_presentational and len(alt) < 5:
-            issues.append({"img_src": im["img_src"], "reason": "missing_or_short_alt"})
+    total = len(images.src)
+    alt_len = np.asarray(images.alt_len, dtype=np.int32)
+    presentational = np.asarray(images.presentational, dtype=bool)
+    # If not explicitly decorative and alt is missing/too short, flag
+    issues = [{"img_src": images.src[i], "reason": "missing_or_short_alt"}
+              for i in np.flatnonzero(~presentational & (alt_len < 5))]
     score = 1.0
     if total > 0:
         score = max(0.0, 1.0 - (len(issues) / total))
@@ -82,49 +188,31 @@ def evaluate_images_baseline(images):
 
 # ---------- LINKS ----------
 def clean_text(t: str) -> str:
-    return re.sub(r"\s+", " ", (t or "").strip()).lower()
-
-def extract_links(soup: BeautifulSoup, base_url: str):
-    links = []
-    for a in soup.find_all("a"):
-        text = clean_text(a.get_text(" ").strip())
-        href = a.get("href") or ""
-        if not href:
-            continue
-        links.append({
-            "anchor_text": text,
-            "href": urljoin(base_url, href)
-        })
-    return links
-
-def evaluate_links_baseline(links):
-    def is_contact(href, text):
-        t = (text or "").lower()
-        h = (href or "").lower()
-        return h.startswith("tel:") or h.startswith("mailto:") or "@" in h or "@" in t
+    return _WS_RE.sub(" ", (t or "").strip()).lower()
 
-    def is_lang_switch(text):
-        t = (text or "").strip().lower()
-        return t in {"it","ita","en","eng","de","fr","es"}
+def _has_alpha_tokens(text: str, k: int) -> bool:
+    # si ferma appena trova k token alfabetici, senza costruire liste
+    n = 0
+    for m in _SPLIT_TOKEN_RE.finditer(text):
+        if m.group().isalpha():
+            n += 1
+            if n >= k:
+                return True
+    return False
 
+def evaluate_links_baseline(links):
+    # links è già de-duplicato da extract_all
     generic = []
-    seen = set()
-    total = 0
-    for lk in links:
-        txt = lk["anchor_text"]
-        href = lk["href"]
-        key = (txt, href)
-        if key in seen:  # de-duplica
+    total = len(links.href)
+    for txt, href in zip(links.anchor_text, links.href):
+        # esenzioni: icone vuote/lingua/contatti (anchor_text è già pulito e minuscolo)
+        if txt == "" or txt in LANG_SWITCH:
             continue
-        seen.add(key)
-        total += 1
-
-        tokens = [t for t in txt.split() if t.isalpha()]
-        # esenzioni: lingua/contatti/icone vuote
-        if is_lang_switch(txt) or is_contact(href, txt) or txt == "":
+        h = href.lower()
+        if h.startswith(("tel:", "mailto:")) or "@" in h or "@" in txt:
             continue
 
-        is_generic = (txt in GENERIC_LINKS) or (len(tokens) < 2)
+        is_generic = (txt in GENERIC_LINKS) or not _has_alpha_tokens(txt, 2)
         if is_generic:
             generic.append({"text": txt, "href": href})
 
@@ -132,66 +220,54 @@ def evaluate_links_baseline(links):
     return {"score": round(score, 2), "generic_links": generic, "total": total}
 
 # ---------- READABILITY ----------
-def split_sentences(text: str):
-    # splitter super semplice (basta per baseline)
-    return [s.strip() for s in re.split(r"[.!?]+", text) if s.strip()]
-
-def avg_sentence_length_words(text: str) -> float:
-    sentences = split_sentences(text)
-    if not sentences:
-        return 0.0
-    lengths = []
-    for s in sentences:
-        words = [w for w in re.findall(r"[A-Za-zÀ-ÖØ-öø-ÿ']+", s)]
-        if words:
-            lengths.append(len(words))
-    return statistics.mean(lengths) if lengths else 0.0
-
-def avg_word_length(text: str) -> float:
-    words = [w for w in re.findall(r"[A-Za-zÀ-ÖØ-öø-ÿ']+", text)]
-    if not words:
-        return 0.0
-    return statistics.mean(len(w) for w in words)
-
-def extract_paragraphs(soup: BeautifulSoup, limit=40):
-    paras = []
-    for i, p in enumerate(soup.find_all(["p", "li"])):
-        txt = clean_text(p.get_text(" ").strip())
-        if len(txt) < 40:  # ignora pezzi troppo corti/rumore
-            continue
-        paras.append({"id": f"node-{i}", "text": txt})
-        if len(paras) >= limit:
-            break
-    return paras
+def _scan_stats_many(texts):
+    """
+    Restituisce tre liste parallele: n. frasi, n. parole, caratteri delle parole.
+    Le frasi senza parole non vengono contate. Il conteggio avviene tutto
+    dentro il motore regex (findall + len), senza cicli Python per parola.
+    """
+    sentences, words, word_chars = [], [], []
+    for t in texts:
+        found = _WORD_RE.findall(t)
+        sentences.append(len(_WORDY_SENT_RE.findall(t)))
+        words.append(len(found))
+        word_chars.append(len("".join(found)))
+    return sentences, words, word_chars
 
-def label_readability(text: str):
+def _label_codes(sentences, words, word_chars):
     """
+    Etichette vettoriali: 0 = easy, 1 = medium, 2 = difficult.
     Heuristics:
       - Easy: avg sentence len <= 15 AND avg word len <= 4.7
       - Difficult: avg sentence len > 25 OR avg word len > 5.5
       - Medium: altrimenti
     """
-    asl = avg_sentence_length_words(text)
-    awl = avg_word_length(text)
-    if asl <= 15 and awl <= 4.7:
-        return "easy"
-    if asl > 25 or awl > 5.5:
-        return "difficult"
-    return "medium"
+    sentences = np.asarray(sentences, dtype=np.int64)
+    words = np.asarray(words, dtype=np.int64)
+    word_chars = np.asarray(word_chars, dtype=np.int64)
+    asl = np.divide(words, sentences, out=np.zeros(len(words)), where=sentences > 0)
+    awl = np.divide(word_chars, words, out=np.zeros(len(words)), where=words > 0)
+    easy = (asl <= 15) & (awl <= 4.7)
+    difficult = (asl > 25) | (awl > 5.5)
+    return np.where(easy, 0, np.where(difficult, 2, 1))
+
+def _label_texts(texts):
+    """
+    Come _label_codes, ma ogni testo distinto viene analizzato una volta sola
+    (i paragrafi ripetuti, es. disclaimer, riusano l'etichetta già calcolata).
+    """
+    index = {}
+    inverse = np.fromiter((index.setdefault(t, len(index)) for t in texts), dtype=np.intp, count=len(texts))
+    codes = _label_codes(*_scan_stats_many(list(index)))
+    return codes[inverse]
 
 def evaluate_readability_baseline(paragraphs):
-    labeled = []
-    total = len(paragraphs)
+    total = len(paragraphs.text)
+    labels = _label_texts(paragraphs.text)
+    easy_cnt, medium_cnt, difficult_cnt = (int(c) for c in np.bincount(labels, minlength=3))
     difficult_segments = []
-    easy_cnt = medium_cnt = difficult_cnt = 0
-    for p in paragraphs:
-        lab = label_readability(p["text"])
-        labeled.append({"id": p["id"], "label": lab, "snippet": p["text"][:160] + ("..." if len(p["text"]) > 160 else "")})
-        if lab == "easy": easy_cnt += 1
-        elif lab == "medium": medium_cnt += 1
-        else:
-            difficult_cnt += 1
-            difficult_segments.append({"id": p["id"], "snippet": p["text"][:160] + ("..." if len(p["text"]) > 160 else "")})
+    for i in np.flatnonzero(labels == 2):
+        difficult_segments.append({"id": paragraphs.id[i], "snippet": paragraphs.snippet[i]})
     # score: 1 - quota di 'difficult'
     score = 1.0
     if total > 0:
@@ -227,13 +303,13 @@ def build_suggestions(img_res, read_res, link_res):
     return suggestions
 
 # ---------- MAIN ----------
-def run(url: str):
-    html = fetch_html(url)
+# download paralleli in modalità batch (<= pool_maxsize della sessione)
+FETCH_WORKERS = 8
+
+def analyze_html(url: str, html: str):
     soup = parse_dom(html)
 
-    images = extract_images(soup, url)
-    links = extract_links(soup, url)
-    paragraphs = extract_paragraphs(soup)
+    images, links, paragraphs = extract_all(soup, url)
 
     img_res = evaluate_images_baseline(images)
     link_res = evaluate_links_baseline(links)
@@ -242,7 +318,7 @@ def run(url: str):
     final_score, final_rating = aggregate_scores(img_res["score"], read_res["score"], link_res["score"])
     suggestions = build_suggestions(img_res, read_res, link_res)
 
-    result = {
+    return {
         "url": url,
         "modules": {
             "images": img_res,
@@ -253,10 +329,46 @@ def run(url: str):
         "final_rating": final_rating,
         "suggestions": suggestions
     }
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+def run(url: str):
+    result = analyze_html(url, fetch_html(url))
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
+
+def run_batch(urls):
+    """
+    Più URL: i download (I/O) girano in thread sulla sessione condivisa,
+    parsing e valutazione (CPU) in processi separati man mano che le pagine arrivano.
+    Un URL che fallisce produce {"url": ..., "error": ...} senza fermare gli altri;
+    l'output segue l'ordine degli URL in input.
+    """
+    results = [None] * len(urls)
+    # "spawn": i worker non nascono da un fork del processo mentre i thread
+    # di download sono attivi (lock ereditati → possibili deadlock)
+    workers = ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(urls)),
+                                  mp_context=multiprocessing.get_context("spawn"))
+    with workers, ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(urls))) as fetchers:
+        downloads = {fetchers.submit(fetch_html, url): i for i, url in enumerate(urls)}
+        analyses = {}
+        for fut in as_completed(downloads):
+            i = downloads[fut]
+            try:
+                html = fut.result()
+            except Exception as exc:
+                results[i] = {"url": urls[i], "error": str(exc)}
+                continue
+            analyses[workers.submit(analyze_html, urls[i], html)] = i
+        for fut, i in analyses.items():
+            try:
+                results[i] = fut.result()
+            except Exception as exc:
+                results[i] = {"url": urls[i], "error": str(exc)}
+    print(orjson.dumps(results, option=orjson.OPT_INDENT_2).decode())
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Baseline web accessibility evaluation (no ML).")
-    parser.add_argument("--url", required=True, help="Web page URL to evaluate")
+    parser.add_argument("--url", required=True, nargs="+", help="Web page URL(s) to evaluate")
     args = parser.parse_args()
-    run(args.url)
+    if len(args.url) == 1:
+        run(args.url[0])
+    else:
+        run_batch(args.url)